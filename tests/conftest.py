@@ -0,0 +1,32 @@
+"""
+Shared fixtures for the Mergington High School Activities API tests
+"""
+import functools
+
+import pytest
+from src.app import activities
+
+
+@functools.cache
+def _baseline():
+    """Initial (name, participants) pairs of every activity, built once per worker"""
+    return tuple(
+        (name, tuple(details["participants"]))
+        for name, details in activities.items()
+    )
+
+
+# Capture the baseline at collection time, before any test can mutate activities
+_baseline()
+
+
+@pytest.fixture(autouse=True)
+def reset_activities(request):
+    """Restore participants after each test marked with mutates_state"""
+    yield
+
+    if request.node.get_closest_marker("mutates_state") is None:
+        return
+
+    for name, participants in _baseline():
+        activities[name]["participants"] = list(participants)
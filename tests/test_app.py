@@ -1,45 +1,42 @@
 """
 Tests for the Mergington High School Activities API
 """
+from urllib.parse import quote
+
 import pytest
 from fastapi.testclient import TestClient
 from src.app import app, activities
 
+# URL-encoded path segment for every activity, computed once at import
+ACTIVITY_PATH = {name: quote(name) for name in activities}
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the API"""
-    return TestClient(app)
+    """Create a test client for the API, shared by the whole test session"""
+    # Entering the client runs the app lifespan once and keeps one event-loop
+    # portal open for every request instead of starting one per call.
+    # Sharing it is only safe while the app keeps no per-request state outside
+    # `activities`; middleware that holds mutable app state needs a narrower scope.
+    with TestClient(app) as c:
+        yield c
 
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        name: {
-            "description": details["description"],
-            "schedule": details["schedule"],
-            "max_participants": details["max_participants"],
-            "participants": details["participants"].copy()
-        }
-        for name, details in activities.items()
-    }
-    
-    yield
-    
-    # Restore original state after test
-    for name in activities:
-        if name in original_activities:
-            activities[name]["participants"] = original_activities[name]["participants"].copy()
+@pytest.fixture(scope="module")
+def activities_snapshot(client):
+    """Fetch and parse GET /activities once for read-only assertions"""
+    return client.get("/activities").json()
 
 
 class TestRootEndpoint:
     """Tests for the root endpoint"""
     
-    def test_root_redirects_to_static(self, client):
+    def test_root_redirects_to_static(self):
         """Test that root redirects to the static index page"""
-        response = client.get("/", follow_redirects=False)
+        # Call the route's endpoint directly; no HTTP round-trip is needed
+        route = next(r for r in app.routes if getattr(r, "path", None) == "/")
+        assert "GET" in route.methods
+        response = route.endpoint()
         assert response.status_code == 307
         assert response.headers["location"] == "/static/index.html"
 
@@ -47,21 +44,14 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for the GET /activities endpoint"""
     
-    def test_get_activities_returns_200(self, client):
-        """Test that GET /activities returns 200 OK"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-    
-    def test_get_activities_returns_dict(self, client):
+    def test_get_activities_returns_dict(self, activities_snapshot):
         """Test that GET /activities returns a dictionary"""
-        response = client.get("/activities")
-        data = response.json()
+        data = activities_snapshot
         assert isinstance(data, dict)
     
-    def test_get_activities_has_expected_activities(self, client):
+    def test_get_activities_has_expected_activities(self, activities_snapshot):
         """Test that the response includes expected activities"""
-        response = client.get("/activities")
-        data = response.json()
+        data = activities_snapshot
         
         expected_activities = [
             "Chess Club", "Programming Class", "Gym Class", 
@@ -72,10 +62,9 @@ class TestGetActivities:
         for activity in expected_activities:
             assert activity in data
     
-    def test_activity_has_required_fields(self, client):
+    def test_activity_has_required_fields(self, activities_snapshot):
         """Test that each activity has all required fields"""
-        response = client.get("/activities")
-        data = response.json()
+        data = activities_snapshot
         
         required_fields = ["description", "schedule", "max_participants", "participants"]
         
@@ -83,10 +72,9 @@ class TestGetActivities:
             for field in required_fields:
                 assert field in activity_data, f"{activity_name} missing {field}"
     
-    def test_participants_is_list(self, client):
+    def test_participants_is_list(self, activities_snapshot):
         """Test that participants field is a list"""
-        response = client.get("/activities")
-        data = response.json()
+        data = activities_snapshot
         
         for activity_name, activity_data in data.items():
             assert isinstance(activity_data["participants"], list)
@@ -94,11 +82,14 @@ class TestGetActivities:
 
 class TestSignupEndpoint:
     """Tests for the POST /activities/{activity_name}/signup endpoint"""
+
+    pytestmark = pytest.mark.mutates_state
     
     def test_signup_success(self, client):
         """Test successful signup to an activity"""
         response = client.post(
-            "/activities/Chess%20Club/signup?email=newstudent@mergington.edu"
+            f"/activities/{ACTIVITY_PATH['Chess Club']}/signup",
+            params={"email": "newstudent@mergington.edu"},
         )
         assert response.status_code == 200
         data = response.json()
@@ -111,68 +102,78 @@ class TestSignupEndpoint:
         email = "teststudent@mergington.edu"
         
         # Sign up
-        client.post(f"/activities/Math%20Club/signup?email={email}")
+        client.post(
+            f"/activities/{ACTIVITY_PATH['Math Club']}/signup",
+            params={"email": email},
+        )
         
         # Verify participant was added
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Math Club"]["participants"]
-    
-    def test_signup_nonexistent_activity_returns_404(self, client):
-        """Test that signing up for a nonexistent activity returns 404"""
-        response = client.post(
-            "/activities/Nonexistent%20Club/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "detail" in data
-        assert "not found" in data["detail"].lower()
+        assert email in activities["Math Club"]["participants"]
     
     def test_signup_duplicate_returns_400(self, client):
         """Test that signing up twice returns 400 error"""
         email = "duplicate@mergington.edu"
         
         # First signup should succeed
-        response1 = client.post(f"/activities/Drama%20Club/signup?email={email}")
+        response1 = client.post(
+            f"/activities/{ACTIVITY_PATH['Drama Club']}/signup",
+            params={"email": email},
+        )
         assert response1.status_code == 200
         
         # Second signup should fail
-        response2 = client.post(f"/activities/Drama%20Club/signup?email={email}")
+        response2 = client.post(
+            f"/activities/{ACTIVITY_PATH['Drama Club']}/signup",
+            params={"email": email},
+        )
         assert response2.status_code == 400
         data = response2.json()
         assert "already signed up" in data["detail"].lower()
     
     def test_signup_full_activity_returns_400(self, client):
         """Test that signing up for a full activity returns 400"""
-        # Fill up Chess Club (max 12 participants)
-        for i in range(12):
-            response = client.post(f"/activities/Chess%20Club/signup?email=student{i}@mergington.edu")
-            if i < 10:  # First 10 should succeed (2 already exist)
-                assert response.status_code == 200
-        
+        # Fill Chess Club directly up to one free slot
+        chess = activities["Chess Club"]
+        chess["participants"][:] = [
+            f"filler{i}@mergington.edu" for i in range(chess["max_participants"] - 1)
+        ]
+
+        # The last free slot should still be accepted
+        response = client.post(
+            f"/activities/{ACTIVITY_PATH['Chess Club']}/signup",
+            params={"email": "last@mergington.edu"},
+        )
+        assert response.status_code == 200
+
         # Next signup should fail
-        response = client.post("/activities/Chess%20Club/signup?email=overflow@mergington.edu")
+        response = client.post(
+            f"/activities/{ACTIVITY_PATH['Chess Club']}/signup",
+            params={"email": "overflow@mergington.edu"},
+        )
         assert response.status_code == 400
         data = response.json()
         assert "full" in data["detail"].lower()
-    
-    def test_signup_requires_email_parameter(self, client):
-        """Test that signup requires an email parameter"""
-        response = client.post("/activities/Art%20Club/signup")
-        assert response.status_code == 422  # Validation error
 
 
 class TestUnregisterEndpoint:
     """Tests for the DELETE /activities/{activity_name}/unregister endpoint"""
+
+    pytestmark = pytest.mark.mutates_state
     
     def test_unregister_success(self, client):
         """Test successful unregistration from an activity"""
         # First sign up
         email = "testunregister@mergington.edu"
-        client.post(f"/activities/Swimming%20Club/signup?email={email}")
+        client.post(
+            f"/activities/{ACTIVITY_PATH['Swimming Club']}/signup",
+            params={"email": email},
+        )
         
         # Then unregister
-        response = client.delete(f"/activities/Swimming%20Club/unregister?email={email}")
+        response = client.delete(
+            f"/activities/{ACTIVITY_PATH['Swimming Club']}/unregister",
+            params={"email": email},
+        )
         assert response.status_code == 200
         data = response.json()
         assert "message" in data
@@ -183,60 +184,66 @@ class TestUnregisterEndpoint:
         email = "removetest@mergington.edu"
         
         # Sign up
-        client.post(f"/activities/Debate%20Team/signup?email={email}")
+        client.post(
+            f"/activities/{ACTIVITY_PATH['Debate Team']}/signup",
+            params={"email": email},
+        )
         
         # Verify participant was added
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Debate Team"]["participants"]
+        assert email in activities["Debate Team"]["participants"]
         
         # Unregister
-        client.delete(f"/activities/Debate%20Team/unregister?email={email}")
+        client.delete(
+            f"/activities/{ACTIVITY_PATH['Debate Team']}/unregister",
+            params={"email": email},
+        )
         
         # Verify participant was removed
-        response = client.get("/activities")
-        data = response.json()
-        assert email not in data["Debate Team"]["participants"]
-    
-    def test_unregister_nonexistent_activity_returns_404(self, client):
-        """Test that unregistering from a nonexistent activity returns 404"""
-        response = client.delete(
-            "/activities/Nonexistent%20Club/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
-    
-    def test_unregister_not_signed_up_returns_404(self, client):
-        """Test that unregistering when not signed up returns 404"""
-        response = client.delete(
-            "/activities/Basketball%20Team/unregister?email=notsignedup@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not signed up" in data["detail"].lower()
+        assert email not in activities["Debate Team"]["participants"]
     
     def test_unregister_existing_participant(self, client):
         """Test unregistering an existing participant"""
         # Michael is already signed up for Chess Club
         response = client.delete(
-            "/activities/Chess%20Club/unregister?email=michael@mergington.edu"
+            f"/activities/{ACTIVITY_PATH['Chess Club']}/unregister",
+            params={"email": "michael@mergington.edu"},
         )
         assert response.status_code == 200
         
         # Verify removal
-        response = client.get("/activities")
-        data = response.json()
-        assert "michael@mergington.edu" not in data["Chess Club"]["participants"]
-    
-    def test_unregister_requires_email_parameter(self, client):
-        """Test that unregister requires an email parameter"""
-        response = client.delete("/activities/Art%20Club/unregister")
-        assert response.status_code == 422  # Validation error
+        assert "michael@mergington.edu" not in activities["Chess Club"]["participants"]
+
+
+class TestStatusCodes:
+    """Status code and error detail checks across all endpoints"""
+
+    CASES = [
+        ("GET", "/activities", None, 200, None),
+        ("POST", "/activities/Nonexistent%20Club/signup",
+         "student@mergington.edu", 404, "not found"),
+        ("DELETE", "/activities/Nonexistent%20Club/unregister",
+         "student@mergington.edu", 404, "not found"),
+        ("DELETE", f"/activities/{ACTIVITY_PATH['Basketball Team']}/unregister",
+         "notsignedup@mergington.edu", 404, "not signed up"),
+        ("POST", f"/activities/{ACTIVITY_PATH['Art Club']}/signup", None, 422, None),
+        ("DELETE", f"/activities/{ACTIVITY_PATH['Art Club']}/unregister",
+         None, 422, None),
+    ]
+
+    @pytest.mark.parametrize("method,url,email,code,needle", CASES)
+    def test_status_code(self, client, method, url, email, code, needle):
+        """Test that each request returns the expected status and error detail"""
+        params = {"email": email} if email is not None else None
+        response = client.request(method, url, params=params)
+        assert response.status_code == code
+        if needle is not None:
+            assert needle in response.json()["detail"].lower()
 
 
 class TestIntegration:
     """Integration tests for complete workflows"""
+
+    pytestmark = pytest.mark.mutates_state
     
     def test_complete_signup_unregister_workflow(self, client):
         """Test a complete workflow: signup, verify, unregister, verify"""
@@ -248,7 +255,10 @@ class TestIntegration:
         initial_count = len(response.json()[activity]["participants"])
         
         # Sign up
-        response = client.post(f"/activities/{activity.replace(' ', '%20')}/signup?email={email}")
+        response = client.post(
+            f"/activities/{ACTIVITY_PATH[activity]}/signup",
+            params={"email": email},
+        )
         assert response.status_code == 200
         
         # Verify signup
@@ -258,7 +268,10 @@ class TestIntegration:
         assert len(data[activity]["participants"]) == initial_count + 1
         
         # Unregister
-        response = client.delete(f"/activities/{activity.replace(' ', '%20')}/unregister?email={email}")
+        response = client.delete(
+            f"/activities/{ACTIVITY_PATH[activity]}/unregister",
+            params={"email": email},
+        )
         assert response.status_code == 200
         
         # Verify unregister
@@ -276,11 +289,12 @@ class TestIntegration:
         ]
         
         for student in students:
-            response = client.post(f"/activities/Gym%20Class/signup?email={student}")
+            response = client.post(
+                f"/activities/{ACTIVITY_PATH['Gym Class']}/signup",
+                params={"email": student},
+            )
             assert response.status_code == 200
         
         # Verify all students are signed up
-        response = client.get("/activities")
-        data = response.json()
         for student in students:
-            assert student in data["Gym Class"]["participants"]
+            assert student in activities["Gym Class"]["participants"]